@@ -1,85 +1,161 @@
 # Import required libraries
+import os  # For locating the Parquet cache next to the CSV file
 import pandas as pd  # For data manipulation (loading and cleaning CSV data)
 import matplotlib.pyplot as plt  # For creating the H-R diagram plot
 import numpy as np  # For numerical operations (e.g., log calculations)
-from matplotlib.ticker import LogLocator, ScalarFormatter, FuncFormatter  # For customizing axis ticks and formatting
+from matplotlib.ticker import LogLocator, FixedLocator, ScalarFormatter, FuncFormatter  # For customizing axis ticks and formatting
+from matplotlib.lines import Line2D  # For legend proxy markers
+from matplotlib.transforms import blended_transform_factory  # For mixed data/axes coordinates
 
-def load_data(file_path):
-    """Load and validate the star dataset."""
+# Luminosity axis ticks at powers of 10 from 10⁻⁶ to 10⁶, with LaTeX-style exponent labels
+_L_TICKS = tuple(10.0**i for i in range(-6, 7))
+_L_LABELS = tuple(f'$10^{{{i}}}$' for i in range(-6, 7))
+_L_SUBS = (2.0, 5.0)  # Minor tick multiples within each decade
+
+# Major temperature ticks (in Kelvin) for the primary x-axis
+_MAJOR_TICKS = (40000, 30000, 20000, 10000, 7500, 6000, 5000, 3000)
+
+# Spectral classes (hot to cool) and their temperature boundaries (in Kelvin)
+_SPEC_CLASSES = ('O', 'B', 'A', 'F', 'G', 'K', 'M')
+_SPEC_BOUNDS = np.array([40000, 30000, 10000, 7500, 6000, 3700, 2000], dtype=np.float64)
+
+# Star type lookup table as parallel arrays indexed by star type number (0-5)
+_LABELS = np.array(['Red Dwarf',      # 0: Common low-mass main sequence stars
+                    'Brown Dwarf',    # 1: Failed stars that don't sustain hydrogen fusion
+                    'White Dwarf',    # 2: Dense stellar remnants
+                    'Main Sequence',  # 3: Hydrogen-burning stars (most common)
+                    'Giant',          # 4: Evolved, expanded stars
+                    'Supergiant'],    # 5: Extremely massive, luminous stars
+                   dtype=object)
+_SIZES = np.array([30, 20, 25, 50, 80, 100], dtype=np.int16)  # Marker sizes
+_COLORS = np.array(['red', 'maroon', 'green', 'blue', 'orange', 'purple'], dtype=object)  # Marker colors
+
+def load_data(file_path, use_arrow=False):
+    """Load and validate the star dataset (with Arrow-backed columns if use_arrow is True)."""
     try:
-        # Read the CSV file into a pandas DataFrame
-        df = pd.read_csv(file_path)
-        
         # Define required columns for the H-R diagram
         required_columns = ['Temperature (K)', 'Luminosity(L/Lo)', 'Absolute magnitude(Mv)', 'Star type', 'Spectral Class']
         
-        # Check if all required columns exist in the dataset
-        if not all(col in df.columns for col in required_columns):
-            # Raise an error if any required column is missing
-            raise ValueError("Dataset must contain required columns: Temperature (K), Luminosity(L/Lo), Absolute magnitude(Mv), Star type, Spectral Class")
+        # Binary Parquet cache stored next to the CSV (e.g. '6 class csv.parquet')
+        cache = os.path.splitext(file_path)[0] + '.parquet'
+        
+        # Narrow dtypes so the parser allocates compact columns directly
+        column_dtypes = {
+            'Temperature (K)': 'float32',
+            'Luminosity(L/Lo)': 'float32',
+            'Absolute magnitude(Mv)': 'float32',
+            'Star type': 'int8',
+            'Spectral Class': 'category'
+        }
+        
+        if use_arrow:
+            # Arrow-backed numeric columns; Spectral Class stays categorical (already dictionary-encoded)
+            column_dtypes = {
+                'Temperature (K)': 'float32[pyarrow]',
+                'Luminosity(L/Lo)': 'float32[pyarrow]',
+                'Absolute magnitude(Mv)': 'float32[pyarrow]',
+                'Star type': 'int8[pyarrow]',
+                'Spectral Class': 'category'
+            }
+            # The pyarrow CSV engine only accepts usecols as a list of names
+            read_options = {'usecols': required_columns, 'engine': 'pyarrow', 'dtype_backend': 'pyarrow'}
+        else:
+            read_options = {'usecols': lambda col: col in required_columns, 'engine': 'c'}
+        
+        # Parse Star type as a wide integer so out-of-range values are caught below instead of
+        # silently wrapping around in int8; it is narrowed with the other columns once validated
+        csv_dtypes = dict(column_dtypes, **{'Star type': 'int64[pyarrow]' if use_arrow else 'int64'})
+        
+        # Fast path: reuse the cache if it is at least as new as the CSV
+        df = None
+        if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(file_path):
+            try:
+                # Only the required columns are read from the columnar file
+                df = pd.read_parquet(cache, columns=required_columns, engine='pyarrow')
+            except (OSError, ValueError) as e:
+                # An unreadable cache (e.g., truncated file) falls back to the CSV and is rewritten
+                print(f"Ignoring unreadable Parquet cache: {e}")
+        
+        if df is None:
+            # Read only the required columns of the CSV file
+            df = pd.read_csv(file_path, dtype=csv_dtypes, **read_options)
+            
+            # Check if all required columns exist in the dataset
+            if set(required_columns).difference(df.columns):
+                # Raise an error if any required column is missing
+                raise ValueError("Dataset must contain required columns: Temperature (K), Luminosity(L/Lo), Absolute magnitude(Mv), Star type, Spectral Class")
+            
+            # Check that every star type has an entry in the lookup table
+            if not df['Star type'].between(0, len(_LABELS) - 1).all():
+                raise ValueError(f"Star type must be an integer from 0 to {len(_LABELS) - 1}")
+            
+            # Write the Parquet cache so later runs skip CSV parsing; the cache is only a
+            # speed-up, so a failed write is reported and the CSV data is used as is
+            tmp_cache = cache + '.tmp'
+            try:
+                # Write to a temporary file and move it into place so a partial cache is never left behind
+                df.to_parquet(tmp_cache, compression='snappy', engine='pyarrow')
+                os.replace(tmp_cache, cache)
+            except OSError as e:
+                print(f"Could not write Parquet cache: {e}")
+                # Clean up a partially written temporary file, if any
+                try:
+                    os.remove(tmp_cache)
+                except OSError:
+                    pass
+        
+        # Guarantee narrow dtypes whatever the source (e.g., a cache written with float64 columns)
+        df = df.astype(column_dtypes)
         
         # Return the validated DataFrame
         return df
     
-    # Catch and print any exceptions (e.g., file not found, invalid CSV)
-    except Exception as e:
+    # Catch and print loading errors (missing file, malformed CSV, missing columns or bad values);
+    # the pyarrow engine reports a missing required column as a KeyError. Parquet cache read/write
+    # errors are handled where they occur, so only the CSV itself can make loading fail
+    except (FileNotFoundError, pd.errors.ParserError, ValueError, KeyError) as e:
         print(f"Error loading data: {e}")
         return None
 
 def map_star_types(df):
     """Map numeric star types to descriptive labels with accurate classifications"""
-    # Define a dictionary mapping star type numbers to (label, marker size, color)
-    star_type_map = {
-        0: ('Red Dwarf', 30, 'red'),     # Common low-mass main sequence stars
-        1: ('Brown Dwarf', 20, 'maroon'),# Failed stars that don't sustain hydrogen fusion
-        2: ('White Dwarf', 25, 'green'),  # Dense stellar remnants
-        3: ('Main Sequence', 50, 'blue'),# Hydrogen-burning stars (most common)
-        4: ('Giant', 80, 'orange'),       # Evolved, expanded stars
-        5: ('Supergiant', 100, 'purple') # Extremely massive, luminous stars
-    }
+    # Star type numbers double as indices into the lookup arrays
+    star_types = df['Star type'].to_numpy()
+    
+    # Reject unknown star types instead of plotting them with the wrong class
+    # (negative values would wrap around and larger ones have no lookup entry)
+    if ((star_types < 0) | (star_types >= len(_LABELS))).any():
+        raise ValueError(f"Star type must be an integer from 0 to {len(_LABELS) - 1}")
+    idx = star_types.astype(np.int8)
     
-    # Map 'Star type' column to descriptive labels (e.g., 0 → 'Red Dwarf')
-    df['Star type label'] = df['Star type'].map(lambda x: star_type_map[x][0])
+    # Store descriptive labels (e.g., 0 → 'Red Dwarf') as a categorical on the star type codes
+    df['Star type label'] = pd.Categorical.from_codes(idx, categories=_LABELS)
     
-    # Map 'Star type' to marker sizes for visualization
-    df['Marker size'] = df['Star type'].map(lambda x: star_type_map[x][1])
+    # Gather marker sizes for visualization
+    df['Marker size'] = _SIZES[idx]
     
-    # Map 'Star type' to colors for visualization
-    df['Color'] = df['Star type'].map(lambda x: star_type_map[x][2])
+    # Store colors for visualization as a categorical on the same codes
+    df['Color'] = pd.Categorical.from_codes(idx, categories=_COLORS)
     
     return df  # Return the modified DataFrame
 
-def create_spectral_class_axis(ax, temp_range):
-    """Create secondary x-axis (top) for Spectral Class based on temperature"""
-    # Define spectral classes (hot to cool): O, B, A, F, G, K, M
-    spectral_classes = ['O', 'B', 'A', 'F', 'G', 'K', 'M']
-    
-    # Define temperature boundaries for spectral classes (in Kelvin)
-    temp_bounds = [40000, 30000, 10000, 7500, 6000, 3700, 2000]
-    
-    # Create a secondary x-axis (top) using twiny()
-    ax2 = ax.twiny()
-    
-    # Set the secondary x-axis to logarithmic scale
-    ax2.set_xscale('log')
-    
-    # Set the limits of the secondary x-axis to match the dataset's temperature range
-    ax2.set_xlim(temp_range)
-    
-    # Set tick locations to spectral class boundaries
-    ax2.set_xticks(temp_bounds)
-    
-    # Set tick labels to spectral class names
-    ax2.set_xticklabels(spectral_classes)
-    
-    # Label the secondary x-axis
-    ax2.set_xlabel('Spectral Class', fontsize=12)
-    
-    # Invert the secondary x-axis to match the primary (hotter on left)
-    ax2.invert_xaxis()
-    
-    # Return the secondary axis object
-    return ax2
+def create_spectral_class_labels(ax):
+    """Label Spectral Classes along the top of the plot based on temperature"""
+    # Anchor text at data x (temperature) and the top of the axes, so labels follow the primary x-axis
+    trans = blended_transform_factory(ax.transData, ax.transAxes)
+    
+    # Write each spectral class name at its temperature boundary; annotation_clip hides any
+    # whose temperature is outside the current x-limits, including after pan/zoom or set_xlim
+    labels = [ax.annotate(name, xy=(T, 1), xycoords=trans, xytext=(0, 4), textcoords='offset points',
+                          ha='center', va='bottom', annotation_clip=True)
+              for T, name in zip(_SPEC_BOUNDS, _SPEC_CLASSES)]
+    
+    # Label the spectral classes, centered above them
+    ax.annotate('Spectral Class', xy=(0.5, 1), xycoords='axes fraction', xytext=(0, 18),
+                textcoords='offset points', ha='center', va='bottom', fontsize=12)
+    
+    # Return the spectral class text objects
+    return labels
 
 def create_luminosity_axis(ax, mv_range):
     """Create secondary y-axis (right) for Luminosity(L/Lo) using powers of 10"""
@@ -96,106 +172,147 @@ def create_luminosity_axis(ax, mv_range):
     # Set axis limits for luminosity
     ax3.set_ylim(l_min, l_max)
 
-    # Define ticks at powers of 10 from 10⁻⁶ to 10⁶
-    l_ticks = [10**i for i in range(-6, 7)]  # Generate 10⁻⁶, 10⁻⁵, ..., 10⁶
-    l_labels = [f'$10^{{{i}}}$' for i in range(-6, 7)]  # Format as LaTeX-style exponents
-    
-    # Set ticks and labels for luminosity axis
-    ax3.set_yticks(l_ticks)
-    ax3.set_yticklabels(l_labels)
+    # Set ticks and labels for luminosity axis (powers of 10 from 10⁻⁶ to 10⁶)
+    ax3.set_yticks(_L_TICKS)
+    ax3.set_yticklabels(_L_LABELS)
 
     # Add minor ticks for better readability on log scale
-    ax3.yaxis.set_minor_locator(LogLocator(base=10.0, subs=np.arange(1, 10)))
+    ax3.yaxis.set_minor_locator(LogLocator(base=10.0, subs=_L_SUBS, numticks=30))
     
     # Label the secondary y-axis
     ax3.set_ylabel('Luminosity (L/Lo)', fontsize=12)
     
     return ax3  # Return the secondary axis object
 
-def plot_hr_diagram(df):
-    """Plot the H-R diagram with all required axes and visualizations"""
-    # Create a new figure and axis with specified size (14x10 inches)
-    fig, ax = plt.subplots(figsize=(14, 10))
-    
-    # Iterate over each unique star type and its corresponding color
-    for s_type, color in zip(df['Star type label'].unique(), df['Color'].unique()):
-        # Filter the DataFrame for the current stellar type
-        subset = df[df['Star type label'] == s_type]
+class HRPlotter:
+    """H-R diagram figure that can be redrawn with new data without rebuilding its artists"""
+
+    def __init__(self, df):
+        # Create a new figure and axis with specified size (14x10 inches),
+        # laid out by the constrained layout engine at draw time
+        self.fig, self.ax = plt.subplots(figsize=(14, 10), layout='constrained')
+        ax = self.ax
         
-        # Check if the subset is not empty before plotting
-        if not subset.empty:
-            # Plot a scatter plot for the subset
-            ax.scatter(subset['Temperature (K)'], 
-                      subset['Absolute magnitude(Mv)'],
-                      c=color,               # Use the defined color
-                      s=subset['Marker size'].iloc[0],  # Use marker sizes from DataFrame
-                      label=s_type,          # Set legend label
-                      alpha=0.7,            # Set transparency for better visibility
-                      edgecolors='black',    # Add black edges to markers
-                      linewidth=0.5)         # Set edge thickness
+        # Plot every star in a single scatter call with per-point colors and sizes
+        self.pc = ax.scatter(df['Temperature (K)'].to_numpy(),
+                             df['Absolute magnitude(Mv)'].to_numpy(),
+                             c=df['Color'].to_numpy(),       # Use the mapped colors
+                             s=df['Marker size'].to_numpy(), # Use marker sizes from DataFrame
+                             alpha=0.7,                      # Set transparency for better visibility
+                             edgecolors='black',             # Add black edges to markers
+                             linewidth=0.5,                  # Set edge thickness
+                             rasterized=True)                # Render points as one image in vector output
 
-    # Set the x-axis to logarithmic scale (temperature spans wide range)
-    ax.set_xscale('log')
-    
-    # Invert the x-axis (hotter stars on the left)
-    ax.invert_xaxis()
-    
-    # Invert the y-axis (lower magnitude = brighter stars)
-    ax.invert_yaxis()
-    
-    # Label the primary x-axis
-    ax.set_xlabel('Temperature (K)', fontsize=12)
-    
-    # Label the primary y-axis
-    ax.set_ylabel('Absolute Magnitude (Mv)', fontsize=12)
-    
-    # Set the plot title with padding to avoid overlap
-    ax.set_title('Hertzsprung-Russell Diagram', fontsize=14, pad=30)
-    
-    # Add a legend with font size 10 (bbox_to_anchor adjusts legend position)
-    ax.legend(title='Stellar Classification', bbox_to_anchor=(1.05, 1), loc='upper left')
-    
-    # Add grid lines for both major and minor ticks (dashed lines with 60% opacity)
-    ax.grid(True, which="both", ls="--", alpha=0.6)
-    
-    # Calculate temperature range with 10% buffer for visualization
-    temp_min, temp_max = df['Temperature (K)'].min() * 0.9, df['Temperature (K)'].max() * 1.1
-    
-    # Set x-axis limits (inverted due to log scale)
-    ax.set_xlim(temp_max, temp_min)
-    
-    # Calculate magnitude range with 1-unit buffer for visualization
-    mv_min, mv_max = df['Absolute magnitude(Mv)'].min() - 1, df['Absolute magnitude(Mv)'].max() + 1
-    
-    # Set y-axis limits (inverted via invert_yaxis())
-    ax.set_ylim(mv_max, mv_min)
-    
-    # Define major temperature ticks (e.g., 40000 K, 30000 K, etc.)
-    major_ticks = [40000, 30000, 20000, 10000, 7500, 6000, 5000, 3000]
-    
-    # Set major tick locations on x-axis
-    ax.set_xticks(major_ticks)
-    
-    # Use ScalarFormatter to display plain numbers (e.g., 2000 instead of 2e3)
-    ax.xaxis.set_major_formatter(ScalarFormatter())
-    
-    # Add minor ticks for finer granularity on log scale
-    ax.xaxis.set_minor_locator(LogLocator(base=10.0, subs=np.arange(2, 10), numticks=10))
-    
-    # Adjust minor tick length
-    ax.tick_params(which='minor', length=4)
-    
-    # Add secondary spectral class axis (top x-axis)
-    create_spectral_class_axis(ax, (temp_min, temp_max))
-    
-    # Add secondary luminosity axis (right y-axis)
-    create_luminosity_axis(ax, (mv_min, mv_max))
-    
-    # Adjust layout to prevent overlap of labels and axes
-    plt.tight_layout(rect=[0, 0, 1, 0.96])  # Reserve space for title
-    
-    # Display the final plot
-    plt.show()
+        # Set the x-axis to logarithmic scale (temperature spans wide range)
+        ax.set_xscale('log')
+        
+        # Invert the x-axis (hotter stars on the left)
+        ax.invert_xaxis()
+        
+        # Invert the y-axis (lower magnitude = brighter stars)
+        ax.invert_yaxis()
+        
+        # Label the primary x-axis
+        ax.set_xlabel('Temperature (K)', fontsize=12)
+        
+        # Label the primary y-axis
+        ax.set_ylabel('Absolute Magnitude (Mv)', fontsize=12)
+        
+        # Set the plot title with padding to avoid overlap
+        ax.set_title('Hertzsprung-Russell Diagram', fontsize=14, pad=40)
+        
+        # Add the star type legend
+        self._set_legend(df)
+        
+        # Add grid lines for both major and minor ticks (dashed lines with 60% opacity)
+        ax.grid(True, which="both", ls="--", alpha=0.6)
+        
+        # Fit the axis limits to the data
+        _, mv_range = self._set_limits(df)
+        
+        # Fix major tick locations on x-axis (e.g., 40000 K, 30000 K, etc.)
+        ax.xaxis.set_major_locator(FixedLocator(_MAJOR_TICKS))
+        
+        # Use ScalarFormatter to display plain numbers (e.g., 2000 instead of 2e3)
+        ax.xaxis.set_major_formatter(ScalarFormatter())
+        
+        # Add minor ticks for finer granularity on log scale
+        ax.xaxis.set_minor_locator(LogLocator(base=10.0, subs=(2.0, 5.0), numticks=30))
+        
+        # Adjust minor tick length
+        ax.tick_params(which='minor', length=4)
+        
+        # Add spectral class labels along the top x-axis
+        self.spectral_labels = create_spectral_class_labels(ax)
+        
+        # Add secondary luminosity axis (right y-axis)
+        self.ax_luminosity = create_luminosity_axis(ax, mv_range)
+
+    def _set_legend(self, df):
+        """Build one legend entry per star type present in the data"""
+        # Partition once by star type and take each group's color and size for its legend proxy
+        legend_rows = (df.groupby('Star type label', sort=False, observed=True)[['Color', 'Marker size']]
+                         .first()
+                         .reset_index())
+        legend_handles = [Line2D([], [], linestyle='none', marker='o',
+                                 markerfacecolor=color, markeredgecolor='black',
+                                 markeredgewidth=0.5, alpha=0.7,
+                                 markersize=np.sqrt(size),  # scatter sizes are in points², markers in points
+                                 label=label)
+                          for label, color, size in zip(legend_rows['Star type label'],
+                                                        legend_rows['Color'],
+                                                        legend_rows['Marker size'])]
+        
+        # Add a legend with font size 10 (bbox_to_anchor adjusts legend position)
+        self.ax.legend(handles=legend_handles, title='Stellar Classification', bbox_to_anchor=(1.05, 1), loc='upper left')
+
+    def _set_limits(self, df):
+        """Fit the primary axis limits to the data and return the (temperature, magnitude) ranges"""
+        # Compute column minima and maxima of temperature and magnitude in one pass each
+        stats = df[['Temperature (K)', 'Absolute magnitude(Mv)']].to_numpy()
+        t_min, m_min = stats.min(axis=0)
+        t_max, m_max = stats.max(axis=0)
+        
+        # Calculate temperature range with 10% buffer for visualization
+        temp_min, temp_max = t_min * 0.9, t_max * 1.1
+        
+        # Set x-axis limits (inverted due to log scale)
+        self.ax.set_xlim(temp_max, temp_min)
+        
+        # Calculate magnitude range with 1-unit buffer for visualization
+        mv_min, mv_max = m_min - 1, m_max + 1
+        
+        # Set y-axis limits (inverted via invert_yaxis())
+        self.ax.set_ylim(mv_max, mv_min)
+        
+        return (temp_min, temp_max), (mv_min, mv_max)
+
+    def update(self, df):
+        """Redraw the diagram for a new dataset by updating the existing scatter in place"""
+        # Swap point positions, sizes and colors on the existing collection
+        self.pc.set_offsets(np.c_[df['Temperature (K)'].to_numpy(), df['Absolute magnitude(Mv)'].to_numpy()])
+        self.pc.set_sizes(df['Marker size'].to_numpy())
+        self.pc.set_facecolors(df['Color'].to_numpy())
+        
+        # Refresh the legend and limits
+        self._set_legend(df)
+        self._set_limits(df)
+        
+        # Schedule a redraw of the figure
+        self.fig.canvas.draw_idle()
+
+def plot_hr_diagram(df, out=None):
+    """Plot the H-R diagram with all required axes and visualizations, saving it to `out` if given"""
+    # Build the figure with all axes and the star scatter
+    plotter = HRPlotter(df)
+    
+    if out:
+        # Save with vector axes and text; the rasterized scatter is rendered at 300 dpi
+        plotter.fig.savefig(out, dpi=300, bbox_inches='tight')
+        plt.close(plotter.fig)
+    else:
+        # Display the final plot
+        plt.show()
 
 def main():
     # Specify the path to the dataset